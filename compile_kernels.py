@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Ahead-of-Time Kernel Build
+==========================
+Compiles the Faddeev-LeVerrier charpoly kernel of find_analytic_graphs.py
+into a native extension module (graph_kernels), so fresh processes such as
+the --json web mode skip the Numba JIT warmup for it.
+
+Exports:
+    fadlev_i8(A)   int8 matrix  -> int64 coefficients of det(λI - A)
+    fadlev_i64(A)  int64 matrix -> int64 coefficients of det(λI - A)
+
+Usage:
+    python compile_kernels.py
+
+Requirements:
+    pip install numba        # plus a C compiler
+
+find_analytic_graphs.py picks up graph_kernels when it is importable and
+falls back to the JIT (or NumPy) kernel otherwise. Rebuild after changing
+_fadlev or upgrading NumPy/Numba.
+"""
+
+import os
+import warnings
+
+from numba.pycc import CC
+
+from find_analytic_graphs import _fadlev
+
+with warnings.catch_warnings():
+    # numba.pycc is deprecated in favor of a future AOT API, but still works
+    warnings.simplefilter('ignore')
+    cc = CC('graph_kernels')
+
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+cc.export('fadlev_i8', 'i8[:](i1[:,:])')(_fadlev.py_func)
+cc.export('fadlev_i64', 'i8[:](i8[:,:])')(_fadlev.py_func)
+
+
+if __name__ == '__main__':
+    cc.compile()
+    print(f"Built graph_kernels in {cc.output_dir}")
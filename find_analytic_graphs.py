@@ -10,38 +10,101 @@ Optimizations Implemented:
     2. Irreducible Factor Degree Cutoff: Skips root-finding for any characteristic 
        polynomial that contains an irreducible factor of degree 5 or greater, 
        as these are not generally solvable by algebraic means (Abel-Ruffini theorem).
-    3. Weisfeiler-Lehman Hashing: Robust isomorphism detection via NetworkX.
+    3. Isomorphism Filtering: Non-isomorphic graphs come straight from
+       nauty's geng when it is on PATH. Otherwise all edge sets are filtered
+       by exact canonical labeling via nauty (pynauty) when available, or by
+       Weisfeiler-Lehman refinement on adjacency bitmasks.
+    4. Exact Integer Characteristic Polynomial: Coefficients are computed
+       by Faddeev-LeVerrier in int64 arithmetic (integer_charpoly: AOT,
+       Numba or NumPy kernel) instead of a symbolic determinant, and graphs
+       are grouped by their coefficient tuple.
+    5. Analysis Cache: Each coefficient tuple is factored/solved at most once,
+       and results persist across runs in charpoly_cache.pkl.
+    6. Numeric Spectrum Instead of roots(): For polynomials within the
+       degree cutoff, eigenvalues of the Hermitian matrix iA are matched
+       against simple closed forms (rationals, √k, 2cos(kπ/m)) and accepted
+       once their minimal polynomials reproduce the exact factor list;
+       symbolic root-finding only runs when that identification fails.
+       With --numeric the root-finding fallback is skipped altogether
+       (much faster for n >= 7, but nested radicals are missed).
 
 Usage:
     python find_analytic_graphs.py [n]
     python find_analytic_graphs.py --json [n]   # Output JSON only (for web integration)
+    python find_analytic_graphs.py --numeric [n]   # Tabled closed forms only, no SymPy solving
+    (add --legacy to also output full adjacency matrices next to adjacency_bits)
     
     where n is the number of vertices (default: 5)
 
 Requirements:
     pip install sympy numpy networkx
+    pip install pynauty                 # optional, exact isomorphism filter
+    geng (from nauty) on PATH           # optional, direct class generation
+    pip install numba                   # optional, JIT-compiled kernels
+    pip install orjson                  # optional, fast JSON output
+    python compile_kernels.py           # optional, AOT charpoly kernel
 
 Author: Graph Spectral Analysis Project  
 """
 
+import io
+import os
 import sys
 import json
+import math
 import time
-from itertools import combinations
-from collections import defaultdict
+import pickle
+import shutil
+import subprocess
+import threading
+from functools import lru_cache, partial
+from itertools import combinations, islice
+from multiprocessing import Pool
 import numpy as np
 
 # Sympy for symbolic computation
 from sympy import (
-    symbols, Matrix, roots, simplify, expand, factor,
-    sqrt, cos, sin, pi, I, Rational, nsimplify, sympify, factor_list, Abs
+    symbols, Mul, Poly, roots, simplify, minimal_polynomial,
+    sqrt, cos, sin, pi, I, Integer, Rational, nsimplify, Abs
 )
 from sympy.core.numbers import Float
 from sympy.polys.rootoftools import RootOf
+from sympy.polys.domains import ZZ
 
 # NetworkX for graph structure and isomorphism handling
 import networkx as nx
 
+# Optional: nauty bindings for exact canonical labeling
+try:
+    import pynauty
+except ImportError:
+    pynauty = None
+
+# Optional: Numba JIT for the per-candidate kernels
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Pass-through decorator used when Numba is not installed."""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Optional: orjson for fast JSON output
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: ahead-of-time build of the charpoly kernel (compile_kernels.py)
+try:
+    import graph_kernels
+except ImportError:
+    graph_kernels = None
+
 # =====================================================
 # CONFIGURATION
 # =====================================================
@@ -55,6 +118,77 @@ KNOWN_ANALYTIC_FAMILIES = {
 # (Abel-Ruffini theorem)
 MAX_ANALYTIC_DEGREE = 4 
 
+# On-disk cache of polynomial analyses, keyed by (n, coefficient tuple).
+# Bump CACHE_VERSION whenever the eigenvalue analysis output changes.
+CHARPOLY_CACHE_FILE = "charpoly_cache.pkl"
+CACHE_VERSION = 3
+
+# Directory for the --json output cache (one file per n)
+RESULTS_CACHE_DIR = "cache"
+
+# Below this n the process pool costs more than it saves
+PARALLEL_MIN_N = 6
+
+# Isomorphism classes per batch_fadlev call (and per pool task)
+BATCH_SIZE = 4096
+
+# Polynomial variables, created once: x for the characteristic polynomial,
+# y = x² for its halved form
+_X, _Y = symbols('x y')
+
+# Closed-form lookup tables, keyed by the float value rounded to
+# TABLE_DIGITS places (see table_lookup). TRIG_TBL[k-1, n-1] holds
+# (2cos(kπ/n), 2sin(kπ/n)) for 1 <= k < n (NaN elsewhere); TRIG_TABLE is
+# its dict form, filled in row-major (scan) order so the first (k, n)
+# match wins, as in a linear search. SQRT_TABLE holds √k.
+TABLE_DIGITS = 10
+TABLE_TOL = 1e-11
+TRIG_ATOL = 1e-10
+TRIG_FUNCS = ('cos', 'sin')
+
+_K, _N = np.meshgrid(np.arange(1, 20), np.arange(1, 30), indexing='ij')
+TRIG_TBL = np.where((_N > _K)[..., None],
+                    np.stack([2 * np.cos(np.pi * _K / _N),
+                              2 * np.sin(np.pi * _K / _N)], axis=-1),
+                    np.nan)
+
+TRIG_TABLE = {}
+for _k, _n, _f in np.argwhere(~np.isnan(TRIG_TBL)).tolist():
+    TRIG_TABLE.setdefault(round(float(TRIG_TBL[_k, _n, _f]), TABLE_DIGITS),
+                          (_k + 1, _n + 1, TRIG_FUNCS[_f]))
+
+SQRT_TABLE = {round(math.sqrt(_k), TABLE_DIGITS): _k for _k in range(1, 100)}
+
+
+def table_lookup(table, value):
+    """
+    Look up a float in a rounded-key table. Neighboring keys are probed
+    too, so float noise that pushes a value across a rounding boundary
+    still finds its entry.
+    """
+    for probe in (value, value - TABLE_TOL, value + TABLE_TOL):
+        hit = table.get(round(probe, TABLE_DIGITS))
+        if hit is not None:
+            return hit
+    return None
+
+
+def trig_lookup(value):
+    """
+    Find (k, n, func) with 2func(kπ/n) == value. The rounded-key dict
+    answers almost every query; a vectorized np.isclose scan of TRIG_TBL
+    catches values within TRIG_ATOL that rounded away from their key.
+    """
+    hit = table_lookup(TRIG_TABLE, value)
+    if hit is not None:
+        return hit
+    
+    idx = np.argwhere(np.isclose(TRIG_TBL, value, rtol=0, atol=TRIG_ATOL))
+    if len(idx):
+        k, n, f = idx[0].tolist()
+        return k + 1, n + 1, TRIG_FUNCS[f]
+    return None
+
 # =====================================================
 # GRAPH GENERATION & ISOMORPHISM FILTERING
 # =====================================================
@@ -79,15 +213,200 @@ def get_networkx_graph(n, edges):
     return G
 
 
-def canonical_form_nx(n, edges):
-    """Compute the NetworkX graph's canonical label string using WL hash."""
-    G = get_networkx_graph(n, edges)
-    return nx.algorithms.graph_hashing.weisfeiler_lehman_graph_hash(G)
+def edges_array(edges):
+    """Edge list as an (m, 2) int64 array for the JIT kernels."""
+    return np.array(edges, dtype=np.int64).reshape(-1, 2)
+
+
+@njit(cache=True)
+def _popcount(mask):
+    count = 0
+    while mask:
+        mask &= mask - 1
+        count += 1
+    return count
+
+
+@njit(cache=True)
+def _sort_prefix(buf, k):
+    # Insertion sort of buf[:k]; k <= n is tiny
+    for a in range(1, k):
+        x = buf[a]
+        b = a - 1
+        while b >= 0 and buf[b] > x:
+            buf[b + 1] = buf[b]
+            b -= 1
+        buf[b + 1] = x
+
+
+@njit(cache=True)
+def _count_distinct(labels, buf):
+    n = labels.shape[0]
+    buf[:n] = labels
+    _sort_prefix(buf, n)
+    count = 1 if n else 0
+    for a in range(1, n):
+        if buf[a] != buf[a - 1]:
+            count += 1
+    return count
+
+
+@njit(cache=True)
+def _wl_labels(n, edge_arr):
+    """
+    JIT kernel of canonical_form_bitmask: same refinement, with labels
+    combined by an FNV-1a style hash over the sorted neighbor labels.
+    """
+    adj = np.zeros(n, np.int64)
+    for e in range(edge_arr.shape[0]):
+        i, j = edge_arr[e, 0], edge_arr[e, 1]
+        adj[i] |= 1 << j
+        adj[j] |= 1 << i
+    
+    labels = np.empty(n, np.int64)
+    for v in range(n):
+        labels[v] = _popcount(adj[v])
+    buf = np.empty(n, np.int64)
+    new = np.empty(n, np.int64)
+    classes = _count_distinct(labels, buf)
+    
+    for _ in range(n):
+        for v in range(n):
+            k = 0
+            for u in range(n):
+                if (adj[v] >> u) & 1:
+                    buf[k] = labels[u]
+                    k += 1
+            _sort_prefix(buf, k)
+            h = labels[v] ^ -3750763034362895579
+            for a in range(k):
+                h = (h ^ buf[a]) * 1099511628211
+            new[v] = h
+        labels[:] = new
+        refined = _count_distinct(labels, buf)
+        if refined == classes:
+            break
+        classes = refined
+    _sort_prefix(labels, n)
+    return labels
 
 
-def enumerate_unique_graphs(n, use_isomorphism_filter=True):
+def canonical_form_bitmask(n, edges):
+    """
+    Weisfeiler-Lehman key computed directly on neighbor bitmasks
+    (bit u of adj[v] is set iff u ~ v), without building a NetworkX graph.
+    Vertices start labeled by degree and are refined until the number of
+    distinct labels stops growing (at most n rounds); that stopping point
+    is itself isomorphism-invariant.
+    
+    Returns: sorted final vertex labels (tuple, or bytes from the Numba kernel)
+    """
+    if HAVE_NUMBA:
+        return _wl_labels(n, edges_array(edges)).tobytes()
+    
+    adj = [0] * n
+    for i, j in edges:
+        adj[i] |= 1 << j
+        adj[j] |= 1 << i
+    
+    neighbors = [[u for u in range(n) if mask >> u & 1] for mask in adj]
+    labels = [mask.bit_count() for mask in adj]
+    classes = len(set(labels))
+    
+    for _ in range(n):
+        labels = [hash((labels[v], tuple(sorted(labels[u] for u in neighbors[v]))))
+                  for v in range(n)]
+        refined = len(set(labels))
+        if refined == classes:
+            break
+        classes = refined
+    return tuple(sorted(labels))
+
+
+def canonical_form_nauty(n, edges):
+    """Compute nauty's canonical certificate (exact isomorphism invariant)."""
+    adjacency = {v: [] for v in range(n)}
+    for i, j in edges:
+        adjacency[i].append(j)
+        adjacency[j].append(i)
+    return pynauty.certificate(pynauty.Graph(n, adjacency_dict=adjacency))
+
+
+def canonical_form(n, edges):
+    """
+    Canonical form key used for isomorphism filtering: nauty's certificate
+    when pynauty is installed, otherwise the bitmask WL key (which can merge
+    some non-isomorphic graphs, e.g. C_6 and 2·C_3).
+    """
+    if pynauty is not None:
+        return canonical_form_nauty(n, edges)
+    return canonical_form_bitmask(n, edges)
+
+
+def graph_key(n, edges):
+    """
+    Isomorphism key of an edge set. Known analytic families are recognized
+    from their degree sequence and keyed by family name, skipping the
+    canonical form.
+    """
+    family = known_family_of(n, edges)
+    if family is not None:
+        return family
+    return canonical_form(n, edges)
+
+
+def hash_edge_set(n, edges):
+    """Pool worker: pair an edge set with its isomorphism key."""
+    return edges, graph_key(n, edges)
+
+
+def find_geng():
+    """Path of nauty's geng (packaged as nauty-geng on some systems), or None."""
+    return shutil.which('geng') or shutil.which('nauty-geng')
+
+
+def geng_graphs(n, geng='geng'):
+    """
+    Generate one graph per isomorphism class directly with nauty's geng.
+    Yields: (edges, graph6_string)
+    """
+    with subprocess.Popen([geng, '-q', str(n)], stdout=subprocess.PIPE) as proc:
+        for line in proc.stdout:
+            g6 = line.strip()
+            G = nx.from_graph6_bytes(g6)
+            edges = tuple(sorted((min(i, j), max(i, j)) for i, j in G.edges()))
+            yield edges, g6.decode('ascii')
+
+
+def isomorphism_backend():
+    """
+    Name of the isomorphism filter enumerate_unique_graphs will use: 'geng',
+    'nauty' (pynauty) or 'wl'. The representatives, and for WL even the
+    number of classes, differ between them.
+    """
+    if find_geng():
+        return 'geng'
+    if pynauty is not None:
+        return 'nauty'
+    return 'wl'
+
+
+def enumerate_unique_graphs(n, use_isomorphism_filter=True, workers=1,
+                            use_geng=True):
     """
     Generate unique graphs (up to isomorphism) for n vertices.
+    
+    If geng is on PATH (and use_geng), it generates the classes directly and
+    the graph6 string is the key. Otherwise all edge sets are generated and
+    filtered by canonical form as below.
+    
+    With workers > 1 the canonical forms are computed in a process pool;
+    edge sets are consumed in order (by edge count), so the representative
+    chosen for each class is the same as in the serial run.
+    
+    Edge sets in a known analytic family are keyed by family name (see
+    graph_key) without computing a canonical form.
+    
     Yields: (edges, canonical_form_key)
     """
     if not use_isomorphism_filter:
@@ -95,10 +414,25 @@ def enumerate_unique_graphs(n, use_isomorphism_filter=True):
             yield edges, None
         return
     
+    geng = find_geng() if use_geng else None
+    if geng:
+        yield from geng_graphs(n, geng)
+        return
+    
     seen = set()
     
+    if workers > 1:
+        with Pool(workers) as pool:
+            hashed = pool.imap(partial(hash_edge_set, n),
+                               generate_all_edge_sets(n), chunksize=256)
+            for edges, canon in hashed:
+                if canon not in seen:
+                    seen.add(canon)
+                    yield edges, canon
+        return
+    
     for edges in generate_all_edge_sets(n):
-        canon = canonical_form_nx(n, edges)
+        canon = graph_key(n, edges)
         
         if canon not in seen:
             seen.add(canon)
@@ -109,63 +443,411 @@ def enumerate_unique_graphs(n, use_isomorphism_filter=True):
 # MATRIX AND POLYNOMIAL COMPUTATION
 # =====================================================
 
+def edge_columns(edges):
+    """
+    Edge list as two int8 arrays (src, dst) with src < dst, so adjacency
+    structures can be built with vectorized scatters.
+    """
+    arr = np.array(edges, dtype=np.int8).reshape(-1, 2)
+    return arr.min(axis=1), arr.max(axis=1)
+
+
+# Per-thread scratch matrices for make_skew_symmetric_matrix, by size
+_matrix_buffers = threading.local()
+
+
+def get_matrix_buffer(n):
+    """
+    Return a zeroed n×n int8 scratch matrix, allocated once per thread
+    and size and reused by every later call.
+    """
+    buffers = getattr(_matrix_buffers, 'by_size', None)
+    if buffers is None:
+        buffers = _matrix_buffers.by_size = {}
+    
+    A = buffers.get(n)
+    if A is None:
+        A = buffers[n] = np.zeros((n, n), np.int8)
+    else:
+        A.fill(0)
+    return A
+
+
 def make_skew_symmetric_matrix(n, edges):
-    """Create skew-symmetric adjacency matrix."""
-    A = [[0] * n for _ in range(n)]
-    for i, j in edges:
-        if i < j:
-            A[i][j] = 1
-            A[j][i] = -1
-        else:
-            A[j][i] = 1
-            A[i][j] = -1
+    """
+    Create skew-symmetric adjacency matrix (int8 ndarray).
+    The matrix is the shared scratch buffer: it is overwritten by the next
+    call, so copy it (e.g. np.array(A, dtype=...)) to keep it.
+    """
+    src, dst = edge_columns(edges)
+    A = get_matrix_buffer(n)
+    A[src, dst] = 1
+    A[dst, src] = -1
     return A
 
 
-def compute_characteristic_polynomial(A):
+@njit(cache=True)
+def _fadlev(A):
+    """
+    Faddeev-LeVerrier on an int64 matrix: coefficients of det(λI - A),
+    highest degree first. M_k = A M_(k-1) + c_(k-1) I and
+    c_k = -tr(A M_k) / k; the divisions are exact for integer A.
+    """
+    n = A.shape[0]
+    coeffs = np.zeros(n + 1, np.int64)
+    coeffs[0] = 1
+    M = np.eye(n, dtype=np.int64)
+    AM = np.empty((n, n), np.int64)
+    for k in range(1, n + 1):
+        for i in range(n):
+            for j in range(n):
+                acc = 0
+                for l in range(n):
+                    acc += A[i, l] * M[l, j]
+                AM[i, j] = acc
+        trace = 0
+        for i in range(n):
+            trace += AM[i, i]
+        coeffs[k] = -trace // k
+        M[:, :] = AM
+        for i in range(n):
+            M[i, i] += coeffs[k]
+    return coeffs
+
+
+def _fadlev_numpy(A):
+    """_fadlev with NumPy matrix products, for when numba is missing."""
+    n = len(A)
+    coeffs = np.zeros(n + 1, np.int64)
+    coeffs[0] = 1
+    M = np.eye(n, dtype=np.int64)
+    for k in range(1, n + 1):
+        AM = A @ M
+        coeffs[k] = -np.trace(AM) // k
+        M = AM + coeffs[k] * np.eye(n, dtype=np.int64)
+    return coeffs
+
+
+def edge_table(n):
+    """All vertex pairs (i < j) in generation order; row k is edge bit k."""
+    return np.array(list(combinations(range(n), 2)), dtype=np.int64).reshape(-1, 2)
+
+
+def edge_mask(n, edges):
+    """Encode an edge set as a bitmask over edge_table(n)."""
+    mask = 0
+    for i, j in edges:
+        # Index of (i, j) in combinations order
+        mask |= 1 << (i * (2 * n - i - 1) // 2 + j - i - 1)
+    return mask
+
+
+@njit(cache=True)
+def batch_fadlev(masks, n, table):
+    """
+    _fadlev for many graphs at once, each given as an edge bitmask over
+    table. Rows are coefficients of det(λI - A), highest degree first.
+    
+    Deliberately serial: a parallel (prange) kernel starts Numba's thread
+    pool, and a fork-based multiprocessing.Pool opened after that (the
+    enumeration pool, e.g. on the next interactive run) hangs at exit.
+    """
+    out = np.empty((masks.shape[0], n + 1), np.int64)
+    for g in range(masks.shape[0]):
+        A = np.zeros((n, n), np.int64)
+        for k in range(table.shape[0]):
+            if (masks[g] >> np.uint64(k)) & np.uint64(1):
+                A[table[k, 0], table[k, 1]] = 1
+                A[table[k, 1], table[k, 0]] = -1
+        out[g] = _fadlev(A)
+    return out
+
+
+def _fadlev_aot(A):
+    """_fadlev through the compiled graph_kernels module, by dtype."""
+    if A.dtype == np.int8:
+        return graph_kernels.fadlev_i8(A)
+    return graph_kernels.fadlev_i64(A.astype(np.int64, copy=False))
+
+
+if graph_kernels is not None:
+    integer_charpoly = _fadlev_aot
+elif HAVE_NUMBA:
+    integer_charpoly = _fadlev
+else:
+    integer_charpoly = _fadlev_numpy
+
+
+def compute_characteristic_polynomial(A, part=None):
     """
-    Compute the characteristic polynomial det(A - λI).
-    Returns factored sympy polynomial in x.
+    Compute the characteristic polynomial det(A - λI) numerically.
+    
+    The skew-symmetric adjacency matrix has integer entries, so its
+    characteristic polynomial has integer coefficients: they are computed
+    exactly with Faddeev-LeVerrier in int64 arithmetic (integer_charpoly),
+    avoiding the symbolic determinant expansion entirely.
+    
+    For a bipartite graph, part lists the vertices of the smaller side U.
+    Then A = [[0, S], [-Sᵀ, 0]] with S the signed biadjacency block, and
+    det(λI - A) = λ^(n-2k) det(λ²I + SSᵀ), so only the k×k Gram matrix
+    SSᵀ (k = |U| ≤ n/2) needs to be expanded.
+    
+    Returns: tuple of integer coefficients, highest degree first.
     """
     n = len(A)
-    x = symbols('x')
-    M = Matrix(A) - x * Matrix.eye(n)
-    char_poly = M.det()
-    # Factoring helps both root-finding and the degree cutoff check
-    return factor(char_poly), x
+    # The int8 scratch matrix is used as is; no int64/float64 copy
+    A_np = np.asarray(A)
+    
+    if part is not None:
+        k = len(part)
+        coeffs = np.zeros(n + 1, dtype=np.int64)
+        if k == 0:
+            coeffs[0] = 1
+        else:
+            rest = [v for v in range(n) if v not in part]
+            S = A_np[np.ix_(part, rest)]
+            gram = integer_charpoly(S @ S.T)
+            # det(λ²I + M) = Σ (-1)^j g_j λ^(2(k-j)) for det(μI - M) = Σ g_j μ^(k-j)
+            coeffs[0:2 * k + 1:2] = gram * (-1) ** np.arange(k + 1)
+    else:
+        coeffs = integer_charpoly(A_np)
+    # integer_charpoly gives det(λI - A); det(A - λI) differs by (-1)^n
+    if n % 2:
+        coeffs = -coeffs
+    return tuple(int(c) for c in coeffs)
+
+
+def factor_coeffs(coeffs):
+    """
+    Factor the integer-coefficient polynomial over ZZ, once; the factor list
+    serves the degree cutoff, the root-finding and the display string.
+    Returns: (factored polynomial, [(irreducible Poly, multiplicity)], x)
+    """
+    x = _X
+    const, factors = Poly.from_list(coeffs, x, domain=ZZ).factor_list()
+    char_poly = Mul(const, *[f.as_expr() ** m for f, m in factors])
+    return char_poly, factors, x
+
+
+def polynomial_from_coeffs(coeffs):
+    """
+    Build the factored sympy polynomial in x from integer coefficients.
+    Returns: (factored polynomial, x)
+    """
+    char_poly, _, x = factor_coeffs(coeffs)
+    return char_poly, x
+
+
+if HAVE_NUMBA:
+    # Compile (or load from cache) at import, not on the first candidate
+    _wl_labels(2, edges_array([(0, 1)]))
+    if graph_kernels is None:
+        _fadlev(np.zeros((1, 1), np.int64))
+        _fadlev(np.zeros((1, 1), np.int8))
+        batch_fadlev(np.zeros(1, np.uint64), 2, edge_table(2))
 
 
 # =====================================================
 # EIGENVALUE ANALYSIS (WITH DEGREE CUTOFF)
 # =====================================================
 
-def check_degree_cutoff(char_poly, var):
+def check_degree_cutoff(factors):
     """
-    Check if the polynomial contains an irreducible factor of degree > 4.
+    Check if the factor list contains an irreducible factor of degree > 4.
     If so, solving it is generally impossible in closed form (Abel-Ruffini).
     
     Returns: True if degree > MAX_ANALYTIC_DEGREE, False otherwise.
     """
-    try:
-        # Get a list of (irreducible factor, multiplicity)
-        factors = factor_list(char_poly, var)[1]
-        
-        for factor_poly, _ in factors:
-            if factor_poly.as_poly(var).degree() > MAX_ANALYTIC_DEGREE:
-                return True
+    return any(f.degree() > MAX_ANALYTIC_DEGREE for f, _ in factors)
+
+
+# Primes tried by the modular irreducibility pre-screen
+SCREEN_PRIMES = (3, 5, 7, 11, 13)
+
+
+def _gf_trim(a):
+    """Drop leading zero coefficients (lists are lowest degree first)."""
+    while a and a[-1] == 0:
+        a.pop()
+    return a
+
+
+def _gf_rem(a, m, p):
+    """a mod m over GF(p), m monic."""
+    a = list(a)
+    dm = len(m) - 1
+    for i in range(len(a) - 1, dm - 1, -1):
+        c = a[i] % p
+        if c:
+            for j in range(dm + 1):
+                a[i - dm + j] = (a[i - dm + j] - c * m[j]) % p
+    return _gf_trim([c % p for c in a[:dm]])
+
+
+def _gf_mulmod(a, b, m, p):
+    prod = [0] * (len(a) + len(b))
+    for i, ai in enumerate(a):
+        for j, bj in enumerate(b):
+            prod[i + j] += ai * bj
+    return _gf_rem(prod, m, p)
+
+
+def _gf_powmod(a, e, m, p):
+    result = [1]
+    while e:
+        if e & 1:
+            result = _gf_mulmod(result, a, m, p)
+        a = _gf_mulmod(a, a, m, p)
+        e >>= 1
+    return result
+
+
+def _gf_gcd(a, b, p):
+    a, b = _gf_trim(list(a)), _gf_trim(list(b))
+    while b:
+        inv = pow(b[-1], p - 2, p)
+        a = _gf_rem(a, [c * inv % p for c in b], p)
+        a, b = b, a
+    # Monic, so it can serve as a modulus
+    inv = pow(a[-1], p - 2, p) if a else 1
+    return [c * inv % p for c in a]
+
+
+def _gf_minus_y(a, p):
+    """a - y over GF(p)."""
+    a = list(a) + [0] * max(0, 2 - len(a))
+    a[1] = (a[1] - 1) % p
+    return _gf_trim(a)
+
+
+def _gf_quo(a, b, p):
+    """Quotient of a by b over GF(p) (exact division)."""
+    a = list(a)
+    inv = pow(b[-1], p - 2, p)
+    db = len(b) - 1
+    q = [0] * (len(a) - db)
+    for i in range(len(a) - 1, db - 1, -1):
+        c = a[i] * inv % p
+        q[i - db] = c
+        if c:
+            for j in range(db + 1):
+                a[i - db + j] = (a[i - db + j] - c * b[j]) % p
+    return _gf_trim(q)
+
+
+def large_cofactor_mod_p(f, p):
+    """
+    Distinct-degree test over GF(p) for the monic integer polynomial f
+    (lowest degree first): divide out every irreducible factor of degree
+    <= MAX_ANALYTIC_DEGREE, with multiplicity (gcd with y^(p^k) - y,
+    k = 1..MAX_ANALYTIC_DEGREE, repeated until trivial), and report
+    whether anything is left.
+    """
+    f = [c % p for c in f]
+    rest = f
+    power = [0, 1]
+    for _ in range(MAX_ANALYTIC_DEGREE):
+        # y^(p^k) mod f, reduced mod rest (rest divides f)
+        power = _gf_powmod(power, p, f, p)
+        while len(rest) > 1:
+            g = _gf_gcd(rest, _gf_minus_y(_gf_rem(power, rest, p), p), p)
+            if len(g) <= 1:
+                break
+            rest = _gf_quo(rest, g, p)
+    return len(rest) > 1
+
+
+def has_large_irreducible_factor(coeffs):
+    """
+    Cheap, one-sided pre-screen for check_degree_cutoff, on the integer
+    coefficients alone. With the x^r factor removed, every irreducible
+    factor over ZZ of degree <= MAX_ANALYTIC_DEGREE reduces mod p to
+    factors over GF(p) of at most that degree. If those do not account for
+    the whole polynomial (large_cofactor_mod_p), some factor over ZZ is
+    larger, so the cutoff applies. False means "unknown".
+    """
+    c = list(coeffs)
+    while c and c[-1] == 0:
+        c.pop()
+    if len(c) <= MAX_ANALYTIC_DEGREE + 1:
         return False
-    except Exception:
-        # If factoring fails, allow the more expensive root-finding to proceed
+    
+    f = c[::-1]
+    if f[-1] < 0:
+        f = [-a for a in f]
+    if f[-1] != 1:
         return False
+    return any(large_cofactor_mod_p(f, p) for p in SCREEN_PRIMES)
+
+
+def solve_linear(a, b):
+    """Root of a·x + b. Returns [(root, multiplicity)]."""
+    return [(-b / a, 1)]
+
+
+def solve_quadratic(a, b, c):
+    """Roots of a·x² + b·x + c. Returns [(root, multiplicity)]."""
+    disc = b * b - 4 * a * c
+    if disc == 0:
+        return [(-b / (2 * a), 2)]
+    return [((-b + sqrt(disc)) / (2 * a), 1), ((-b - sqrt(disc)) / (2 * a), 1)]
+
+
+# Closed-form solvers by polynomial degree. Factors within the degree
+# cutoff are even (see solve_factor), so halved they never exceed degree 2
+SOLVERS = {1: solve_linear, 2: solve_quadratic}
+
+
+def solve_polynomial(coeffs, var):
+    """
+    Solve a polynomial given by its coefficients (highest degree first),
+    using the closed-form solvers up to degree 2 and sympy.roots beyond.
+    Returns dict: {root: multiplicity}
+    """
+    solver = SOLVERS.get(len(coeffs) - 1)
+    if solver is None:
+        return roots(Poly.from_list(coeffs, var, domain=ZZ), var)
+    
+    result = {}
+    for root, mult in solver(*coeffs):
+        result[root] = result.get(root, 0) + mult
+    return result
+
+
+def solve_factor(f):
+    """
+    Solve one irreducible factor of the characteristic polynomial.
+    
+    A skew-symmetric characteristic polynomial has the form x^r·q(x²), and
+    so do its irreducible factors: their roots come in pairs ±iλ, so every
+    factor other than x is even. q is solved instead (half the degree) and
+    each root μ of q gives the eigenvalue pair ±√μ.
+    Returns dict: {eigenvalue: multiplicity}
+    """
+    coeffs = f.all_coeffs()
+    zero_mult = 0
+    while len(coeffs) > 1 and coeffs[-1] == 0:
+        coeffs.pop()
+        zero_mult += 1
+    
+    y = _Y
+    eigs = {Integer(0): zero_mult} if zero_mult else {}
+    for mu, mult in solve_polynomial(coeffs[::2], y).items():
+        for eig in (sqrt(mu), -sqrt(mu)):
+            eigs[eig] = eigs.get(eig, 0) + mult
+    return eigs
 
 
-def find_eigenvalues(char_poly, var):
+def find_eigenvalues(factors):
     """
-    Find eigenvalues by solving characteristic polynomial.
+    Find eigenvalues by solving each irreducible factor separately.
     Returns dict: {eigenvalue: multiplicity}
     """
     try:
-        eigs = roots(char_poly, var)
+        eigs = {}
+        for f, mult in factors:
+            for eig, m in solve_factor(f).items():
+                eigs[eig] = eigs.get(eig, 0) + m * mult
         return eigs
     except Exception:
         return None
@@ -191,13 +873,15 @@ def is_nice_closed_form(expr):
     return True
 
 
-def classify_eigenvalue(eig):
+def classify_eigenvalue(eig, simp=None):
     """
     Classify an eigenvalue (skew-symmetric implies zero or pure imaginary).
+    simp: simplify(eig), if the caller already has it.
     Returns: (category, display_string)
     """
     try:
-        simp = simplify(eig)
+        if simp is None:
+            simp = simplify(eig)
         
         if simp == 0:
             return ('zero', '0')
@@ -216,61 +900,51 @@ def classify_eigenvalue(eig):
         return ('unknown', str(eig))
 
 
-def format_eigenvalue_for_js(eig):
+def format_eigenvalue_for_js(eig, simp=None):
     """
     Format eigenvalue for JavaScript consumption.
     Try to express in terms of sqrt, cos, sin, etc.
+    simp: simplify(eig), if the caller already has it.
     """
     try:
-        simp = simplify(eig)
+        if simp is None:
+            simp = simplify(eig)
         
         if simp == 0:
             return {'value': 0, 'formula': '0', 'type': 'zero'}
         
-        # Extract imaginary coefficient
-        coeff = simplify(simp / I)
+        # Imaginary coefficient, numerically: eigenvalue = value·i
+        z = complex(simp)
         
-        if coeff.is_real:
-            # Try to nsimplify to find nice form
-            nice = nsimplify(coeff, rational=False)
-            
-            # Check for sqrt patterns
-            nice_str = str(nice)
+        if abs(z.real) < 1e-12:
+            value = z.imag
             
             # Try to detect cos/sin patterns
-            for k in range(1, 20):
-                for n in range(k+1, 30):
-                    test_cos = 2 * cos(pi * k / n)
-                    test_sin = 2 * sin(pi * k / n)
-                    
-                    if abs(float(nice) - float(test_cos)) < 1e-10:
-                        return {
-                            'value': float(nice),
-                            'formula': f'2cos({k}π/{n})',
-                            'type': 'trig',
-                            'k': k, 'n': n, 'func': 'cos'
-                        }
-                    if abs(float(nice) - float(test_sin)) < 1e-10:
-                        return {
-                            'value': float(nice),
-                            'formula': f'2sin({k}π/{n})',
-                            'type': 'trig',
-                            'k': k, 'n': n, 'func': 'sin'
-                        }
+            trig = trig_lookup(value)
+            if trig is not None:
+                k, n, func = trig
+                return {
+                    'value': value,
+                    'formula': f'2{func}({k}π/{n})',
+                    'type': 'trig',
+                    'k': k, 'n': n, 'func': func
+                }
             
             # Check for sqrt patterns
-            for base in range(1, 20):
-                if abs(float(nice) - float(sqrt(base))) < 1e-10:
-                    return {
-                        'value': float(nice),
-                        'formula': f'√{base}',
-                        'type': 'sqrt',
-                        'radicand': base
-                    }
+            radicand = table_lookup(SQRT_TABLE, value)
+            if radicand is not None:
+                return {
+                    'value': value,
+                    'formula': f'√{radicand}',
+                    'type': 'sqrt',
+                    'radicand': radicand
+                }
             
+            # Not tabled: fall back to sympy for a readable exact form
+            nice = nsimplify(simplify(simp / I), rational=False)
             return {
-                'value': float(nice),
-                'formula': nice_str,
+                'value': value,
+                'formula': str(nice),
                 'type': 'algebraic'
             }
         
@@ -280,21 +954,107 @@ def format_eigenvalue_for_js(eig):
         return {'value': str(eig), 'formula': str(eig), 'type': 'unknown', 'error': str(e)}
 
 
-def analyze_eigenvalues(char_poly, x):
+def identify_closed_form(v, tol=1e-10):
+    """
+    Match a non-negative float against simple closed forms: integers,
+    half-integers, and the SQRT_TABLE / TRIG_TABLE entries (√k, 2cos(kπ/m),
+    2sin(kπ/m)), using plain float arithmetic.
+    
+    Returns: exact sympy expression, or None if nothing matches
+    """
+    half = round(2 * v)
+    if abs(v - half / 2) < tol:
+        return Rational(half, 2)
+    
+    radicand = table_lookup(SQRT_TABLE, v)
+    if radicand is not None:
+        return sqrt(radicand)
+    
+    trig = trig_lookup(v)
+    if trig is not None:
+        k, m, func = trig
+        return 2 * (cos if func == 'cos' else sin)(pi * k / m)
+    
+    return None
+
+
+def identify_spectrum(n, edges, tol=1e-10):
+    """
+    Diagonalize the graph numerically and identify every eigenvalue with
+    identify_closed_form, avoiding symbolic root-finding altogether.
+    
+    Returns: {eigenvalue: multiplicity} with exact sympy eigenvalues,
+             or None if any eigenvalue is not recognized
+    """
+    A_np = np.array(make_skew_symmetric_matrix(n, edges), dtype=np.float64)
+    # iA is Hermitian; each real eigenvalue λ of iA is an eigenvalue -iλ of A
+    lambdas = np.linalg.eigvalsh(1j * A_np)
+    
+    eigs = {}
+    for lam in lambdas:
+        form = identify_closed_form(abs(float(lam)), tol)
+        if form is None:
+            return None
+        eig = -I * form if lam > 0 else I * form
+        eigs[eig] = eigs.get(eig, 0) + 1
+    return eigs
+
+
+@lru_cache(maxsize=4096)
+def eigenvalue_minpoly(eig):
+    """
+    Minimal polynomial over QQ of an exact eigenvalue, as primitive integer
+    coefficients (highest degree first, positive leading coefficient).
+    """
+    q = minimal_polynomial(eig, _X, polys=True)
+    _, q = q.clear_denoms(convert=True)
+    _, q = q.primitive()
+    coeffs = tuple(int(c) for c in q.all_coeffs())
+    return coeffs if coeffs[0] > 0 else tuple(-c for c in coeffs)
+
+
+def spectrum_matches(eigs, factors):
     """
-    Analyze a polynomial for nice closed forms, applying the degree cutoff.
+    Exact check of a numerically identified spectrum against the ZZ factor
+    list of the characteristic polynomial. Eigenvalues sharing a minimal
+    polynomial must be as many as its degree, all with one multiplicity,
+    and those (minimal polynomial, multiplicity) pairs must be the factor
+    list; then the product of (x - eig)^mult is the polynomial itself.
+    """
+    found = {}
+    for eig, mult in eigs.items():
+        found.setdefault(eigenvalue_minpoly(eig), []).append(mult)
+    
+    matched = {}
+    for q, mults in found.items():
+        if len(mults) != len(q) - 1 or len(set(mults)) != 1:
+            return False
+        matched[q] = mults[0]
+    return matched == {tuple(int(c) for c in f.all_coeffs()): m
+                       for f, m in factors}
+
+
+def degree_cutoff_analysis():
+    """Analysis result for a polynomial rejected by the degree cutoff."""
+    return {
+        'all_analytic': False,
+        'eigenvalues': [],
+        'skipped_reason': f'irreducible_factor_degree>{MAX_ANALYTIC_DEGREE}',
+        'summary': f'Skipped: Contains irreducible factor of degree > {MAX_ANALYTIC_DEGREE}'
+    }
+
+
+def analyze_eigenvalues(factors):
+    """
+    Analyze a polynomial, given as its ZZ factor list, for nice closed
+    forms, applying the degree cutoff.
     """
     # OPTIMIZATION: Check for irreducible factors of degree > 4
-    if check_degree_cutoff(char_poly, x):
-        return {
-            'all_analytic': False,
-            'eigenvalues': [],
-            'skipped_reason': f'irreducible_factor_degree>{MAX_ANALYTIC_DEGREE}',
-            'summary': f'Skipped: Contains irreducible factor of degree > {MAX_ANALYTIC_DEGREE}'
-        }
+    if check_degree_cutoff(factors):
+        return degree_cutoff_analysis()
 
     # Proceed to root-finding
-    eigs = find_eigenvalues(char_poly, x)
+    eigs = find_eigenvalues(factors)
     
     if eigs is None:
         return {
@@ -304,19 +1064,27 @@ def analyze_eigenvalues(char_poly, x):
             'summary': 'Could not solve polynomial analytically'
         }
     
+    return describe_eigenvalues(eigs)
+
+
+def describe_eigenvalues(eigs):
+    """
+    Build the per-eigenvalue report for {eigenvalue: multiplicity}.
+    """
     results = []
     all_nice = True
     
     for eig, mult in eigs.items():
+        simp = simplify(eig)
         is_nice = is_nice_closed_form(eig)
-        category, nice_str = classify_eigenvalue(eig)
-        js_format = format_eigenvalue_for_js(eig)
+        category, nice_str = classify_eigenvalue(eig, simp)
+        js_format = format_eigenvalue_for_js(eig, simp)
         
         if not is_nice:
             all_nice = False
         
         results.append({
-            'raw': str(simplify(eig)),
+            'raw': str(simp),
             'multiplicity': int(mult),
             'category': category,
             'display': nice_str,
@@ -337,41 +1105,172 @@ def analyze_eigenvalues(char_poly, x):
     }
 
 
+def load_charpoly_cache(filename=CHARPOLY_CACHE_FILE):
+    """Load the persistent analysis cache (empty if missing or stale)."""
+    if not filename or not os.path.exists(filename):
+        return {}
+    try:
+        with open(filename, 'rb') as f:
+            data = pickle.load(f)
+        if data.get('version') == CACHE_VERSION:
+            return data['entries']
+    except Exception:
+        pass
+    return {}
+
+
+def save_charpoly_cache(cache, filename=CHARPOLY_CACHE_FILE):
+    """Write the persistent analysis cache to disk."""
+    if not filename:
+        return
+    try:
+        with open(filename, 'wb') as f:
+            pickle.dump({'version': CACHE_VERSION, 'entries': cache}, f)
+    except OSError:
+        pass
+
+
+def cached_analysis(n, coeffs, cache, edges, numeric_only=False):
+    """
+    Look up (n, coeffs) in the persistent cache, analyzing on a miss.
+    
+    The degree cutoff comes first: polynomials that
+    has_large_irreducible_factor proves to be past it are skipped without
+    SymPy, the rest are factored and checked with check_degree_cutoff.
+    Only below the cutoff does the numeric spectrum of the representative
+    graph (edges) stand in for root-finding, and only if spectrum_matches
+    confirms it against the factor list. With numeric_only, a spectrum
+    that is not fully tabled is reported as skipped instead of solved (and
+    not cached, so a full run still analyzes it).
+    """
+    key = (n, coeffs)
+    if key not in cache:
+        if has_large_irreducible_factor(coeffs):
+            # Dropped without any SymPy work; the polynomial string of a
+            # skipped group is never displayed
+            cache[key] = ('', degree_cutoff_analysis())
+            return cache[key]
+        
+        char_poly, factors, _ = factor_coeffs(coeffs)
+        if check_degree_cutoff(factors):
+            cache[key] = (str(char_poly), degree_cutoff_analysis())
+            return cache[key]
+        
+        eigs = identify_spectrum(n, edges)
+        if eigs is not None and spectrum_matches(eigs, factors):
+            cache[key] = (str(char_poly), describe_eigenvalues(eigs))
+        elif numeric_only:
+            return str(char_poly), {
+                'all_analytic': False,
+                'eigenvalues': [],
+                'skipped_reason': 'not_tabled',
+                'summary': 'Skipped: Numeric spectrum not fully identified'
+            }
+        else:
+            cache[key] = (str(char_poly), analyze_eigenvalues(factors))
+    return cache[key]
+
+
 # =====================================================
 # GRAPH CLASSIFICATION
 # =====================================================
 
-def identify_graph_family(n, edges):
-    """
-    Identify if the graph belongs to a known family.
-    Returns (family_base_name, full_description) or (None, None)
+def is_connected_edges(n, src, dst):
+    """Connectivity by breadth-first search over neighbor bitmasks."""
+    adj = [0] * n
+    for i, j in zip(src.tolist(), dst.tolist()):
+        adj[i] |= 1 << j
+        adj[j] |= 1 << i
+    
+    seen = frontier = 1
+    while frontier:
+        reached = 0
+        for v in range(n):
+            if frontier >> v & 1:
+                reached |= adj[v]
+        frontier = reached & ~seen
+        seen |= reached
+    return seen == (1 << n) - 1
+
+
+# Subscript letter used in the description of each known family
+KNOWN_FAMILY_SYMBOLS = {
+    "Empty graph": "E", "Complete graph": "K", "Cycle graph": "C",
+    "Path graph": "P", "Star graph": "S"
+}
+
+
+def is_known_family_by_degree(n, deg_sorted, m, connected_cheap):
     """
-    G = get_networkx_graph(n, edges)
-    m = G.number_of_edges()
-    is_connected = nx.is_connected(G) if n > 0 else False
-    degrees = sorted([d for _, d in G.degree()], reverse=True)
+    Recognize the KNOWN_ANALYTIC_FAMILIES from the degree sequence (sorted
+    descending), the edge count, and connectivity. Each of these families
+    is a single isomorphism class, so this is exact.
     
-    # Empty graph
+    Returns: family base name, or None
+    """
     if m == 0:
-        return ("Empty graph", f"Empty graph E_{n}")
+        return "Empty graph"
     
-    # Complete graph
     if m == n * (n - 1) // 2:
-        return ("Complete graph", f"Complete graph K_{n}")
+        return "Complete graph"
     
-    if is_connected:
-        # Cycle
-        if m == n and all(d == 2 for d in degrees):
-            return ("Cycle graph", f"Cycle graph C_{n}")
-        
-        # Path
-        if m == n - 1 and degrees == sorted([1, 1] + [2] * (n - 2), reverse=True):
-            return ("Path graph", f"Path graph P_{n}")
+    if connected_cheap:
+        if m == n and all(d == 2 for d in deg_sorted):
+            return "Cycle graph"
         
-        # Star
-        if m == n - 1 and degrees == sorted([n - 1] + [1] * (n - 1), reverse=True):
-            return ("Star graph", f"Star graph S_{n}")
+        if m == n - 1 and list(deg_sorted) == [2] * (n - 2) + [1, 1]:
+            return "Path graph"
         
+        if m == n - 1 and list(deg_sorted) == [n - 1] + [1] * (n - 1):
+            return "Star graph"
+    
+    return None
+
+
+def known_family_of(n, edges):
+    """
+    Cheap pre-exclusion test, run before canonical hashing. Only edge
+    counts that a known family can have get a degree sequence and a
+    connectivity check.
+    
+    Returns: family base name, or None
+    """
+    m = len(edges)
+    if m not in (0, n - 1, n, n * (n - 1) // 2):
+        return None
+    
+    degrees = [0] * n
+    for i, j in edges:
+        degrees[i] += 1
+        degrees[j] += 1
+    
+    connected = False
+    if m in (n - 1, n) and n > 0:
+        src, dst = edge_columns(edges)
+        connected = is_connected_edges(n, src, dst)
+    return is_known_family_by_degree(n, sorted(degrees, reverse=True), m, connected)
+
+
+@lru_cache(maxsize=4096)
+def identify_graph_family(n, edges):
+    """
+    Identify if the graph belongs to a known family. Memoized on the
+    (sorted) edge tuple, bounded so that large n do not stay pinned in
+    memory between runs; repeat runs of small n skip it.
+    Returns (family_base_name, full_description) or (None, None)
+    """
+    src, dst = edge_columns(edges)
+    m = len(src)
+    is_connected = is_connected_edges(n, src, dst) if n > 0 else False
+    degree_counts = np.bincount(np.concatenate([src, dst]), minlength=n)
+    degrees = sorted(degree_counts.tolist(), reverse=True)
+    
+    # Empty, complete, cycle, path, star
+    known = is_known_family_by_degree(n, degrees, m, is_connected)
+    if known is not None:
+        return (known, f"{known} {KNOWN_FAMILY_SYMBOLS[known]}_{n}")
+    
+    if is_connected:
         # Wheel (star + outer cycle)
         if m == 2 * (n - 1) and degrees[0] == n - 1:
             non_hub = degrees[1:]
@@ -396,6 +1295,21 @@ def identify_graph_family(n, edges):
     return (None, None)
 
 
+def bipartite_side(n, edges):
+    """
+    Return the smaller color class of a bipartite graph (sorted vertex
+    list), or None if the graph is not bipartite.
+    """
+    G = get_networkx_graph(n, edges)
+    if not nx.is_bipartite(G):
+        return None
+    color = nx.bipartite.color(G)
+    side = [v for v in range(n) if color[v] == 0]
+    if 2 * len(side) > n:
+        side = [v for v in range(n) if color[v] == 1]
+    return side
+
+
 def edges_to_string(edges):
     """Convert edge list to readable string."""
     if not edges:
@@ -403,6 +1317,16 @@ def edges_to_string(edges):
     return ", ".join(f"{i}-{j}" for i, j in sorted(edges))
 
 
+def adjacency_bits(n, edges):
+    """
+    Packed skew-symmetric adjacency for the output: bit k is edge k of
+    edge_table(n), oriented i -> j (i < j). Upper triangle only, so it
+    stays below 2^53 (exact as a JavaScript number) for n <= 10; unpack
+    with adjacencyFromBits in graph-core.js.
+    """
+    return edge_mask(n, [(min(e), max(e)) for e in edges])
+
+
 def edges_to_adjacency_matrix(n, edges):
     """Convert edges to adjacency matrix (for skew-symmetric)."""
     A = [[0] * n for _ in range(n)]
@@ -420,7 +1344,133 @@ def edges_to_adjacency_matrix(n, edges):
 # MAIN ENUMERATION
 # =====================================================
 
-def find_analytic_graphs(n, verbose=True, include_known=False):
+@lru_cache(maxsize=None)
+def graph_charpoly(n, edges):
+    """
+    Integer charpoly coefficients of a labeled graph, memoized on its edge
+    tuple. The polynomial depends on the labeling (orientation), so the
+    key is the representative's edges rather than its canonical form;
+    enumeration picks the same representative every run.
+    """
+    A = make_skew_symmetric_matrix(n, edges)
+    return compute_characteristic_polynomial(A, bipartite_side(n, edges))
+
+
+def process_edge_set(n, edges):
+    """
+    Per-graph work of Pass 1: family detection and, for graphs outside
+    the known analytic families, the characteristic polynomial.
+    
+    Returns: (family_base, family_desc, coeffs_or_None)
+    """
+    family_base, family_desc = identify_graph_family(n, edges)
+    
+    if family_base in KNOWN_ANALYTIC_FAMILIES:
+        return family_base, family_desc, None
+    
+    return family_base, family_desc, graph_charpoly(n, edges)
+
+
+def processed_graphs(n, workers=1):
+    """
+    Run process_edge_set over every isomorphism class. With the Numba JIT
+    (and no graph_kernels build), processed_graphs_batch computes the
+    charpolys in batches instead. On either path, with workers > 1 the
+    classes are collected first and processed in a pool; imap keeps the
+    enumeration order, so the first graph of each polynomial (its
+    representative) is the same as serially. Serial runs stream the classes.
+    
+    Yields: (edges, canon, family_base, family_desc, coeffs_or_None)
+    """
+    graphs = enumerate_unique_graphs(n, use_isomorphism_filter=True,
+                                     workers=workers)
+    if HAVE_NUMBA and graph_kernels is None and n * (n - 1) // 2 <= 64:
+        yield from processed_graphs_batch(n, graphs, workers)
+        return
+    
+    if workers <= 1:
+        for edges, canon in graphs:
+            yield (edges, canon) + process_edge_set(n, edges)
+        return
+    
+    graphs = list(graphs)
+    chunksize = max(1, len(graphs) // (workers * 4))
+    with Pool(workers) as pool:
+        processed = pool.imap(partial(process_edge_set, n),
+                              [edges for edges, _ in graphs], chunksize)
+        for (edges, canon), result in zip(graphs, processed):
+            yield (edges, canon) + result
+
+
+def batch_charpolys(n, graphs):
+    """
+    Pool worker: charpoly coefficients of det(A - λI) for a list of
+    (edges, canon), encoded as uint64 edge bitmasks for one batch_fadlev
+    call. The batch works on the full matrix, without the bipartite Gram
+    reduction of compute_characteristic_polynomial; the integer charpoly
+    is the same.
+    """
+    masks = np.array([edge_mask(n, edges) for edges, _ in graphs], dtype=np.uint64)
+    rows = batch_fadlev(masks, n, edge_table(n))
+    # batch_fadlev gives det(λI - A); det(A - λI) differs by (-1)^n
+    if n % 2:
+        rows = -rows
+    return rows.tolist()
+
+
+def processed_graphs_batch(n, graphs, workers=1):
+    """
+    processed_graphs on the Numba path: the classes are taken BATCH_SIZE at
+    a time and their charpolys computed by batch_charpolys, in a pool when
+    workers > 1. Family detection stays in this process.
+    """
+    chunks = iter(lambda: list(islice(graphs, BATCH_SIZE)), [])
+    if workers <= 1:
+        batches = ((chunk, batch_charpolys(n, chunk)) for chunk in chunks)
+        yield from batch_records(n, batches)
+        return
+    
+    chunks = list(chunks)
+    with Pool(workers) as pool:
+        rows = pool.imap(partial(batch_charpolys, n), chunks)
+        yield from batch_records(n, zip(chunks, rows))
+
+
+def batch_records(n, batches):
+    """
+    processed_graphs tuples for an iterable of (graphs, charpoly rows).
+    """
+    for chunk, rows in batches:
+        for (edges, canon), row in zip(chunk, rows):
+            family_base, family_desc = identify_graph_family(n, edges)
+            coeffs = None
+            if family_base not in KNOWN_ANALYTIC_FAMILIES:
+                coeffs = tuple(row)
+            yield edges, canon, family_base, family_desc, coeffs
+
+
+def make_graph_data(n, edges, family_base, family_desc):
+    """
+    Record for a graph that may be reported: a new polynomial group's
+    representative or a known-family graph. The edge-derived output fields
+    are built here, once per such graph, and copied into its result.
+    """
+    return {
+        'edges': edges,
+        'family_base': family_base,
+        'family': family_desc,
+        'output': {
+            'edges': [list(e) for e in edges],
+            'edge_string': edges_to_string(edges),
+            'edge_count': len(edges),
+            'adjacency_bits': adjacency_bits(n, edges)
+        }
+    }
+
+
+def find_analytic_graphs(n, verbose=True, include_known=False,
+                         cache_file=CHARPOLY_CACHE_FILE, workers=None,
+                         numeric_only=False, legacy_adjacency=False):
     """
     Find all graphs on n vertices with analytic eigenvalue formulas.
     
@@ -428,6 +1478,15 @@ def find_analytic_graphs(n, verbose=True, include_known=False):
         n: Number of vertices
         verbose: Print progress
         include_known: Include known analytic families in output
+        cache_file: Persistent polynomial analysis cache (None to disable)
+        workers: Worker processes for enumeration and per-graph charpoly
+                 computation (default: all cores for n >= PARALLEL_MIN_N,
+                 otherwise serial)
+        numeric_only: Skip root-finding for polynomials whose numeric
+                      spectrum is not fully tabled (fast, but only tabled
+                      forms are found)
+        legacy_adjacency: Also emit the full n×n 'adjacency_matrix' list
+                          next to the packed 'adjacency_bits'
     
     Returns:
         List of result dictionaries
@@ -441,86 +1500,91 @@ def find_analytic_graphs(n, verbose=True, include_known=False):
     graphs_total = 0
     graphs_skipped_known = 0
     graphs_skipped_poly = 0
+    graphs_skipped_untabled = 0
     
-    poly_groups = defaultdict(list)
+    # coeffs -> {'rep', 'count', 'polynomial', 'analysis'}; only the first
+    # graph of each polynomial is kept, the rest are just counted
+    poly_groups = {}
     known_family_results = []
+    analysis_cache = load_charpoly_cache(cache_file)
     start_time = time.time()
     
-    # Pass 1: Generate and filter
-    for edges, canon in enumerate_unique_graphs(n, use_isomorphism_filter=True):
+    if workers is None:
+        workers = (os.cpu_count() or 1) if n >= PARALLEL_MIN_N else 1
+    
+    # Single streaming pass: generate, filter, and analyze each polynomial
+    # the first time it is seen
+    # The isomorphism key is not needed past enumeration, so it is not kept
+    for edges, _, family_base, family_desc, coeffs in processed_graphs(n, workers):
         graphs_total += 1
-        family_base, family_desc = identify_graph_family(n, edges)
-        
-        graph_data = {
-            'edges': edges,
-            'family_base': family_base,
-            'family': family_desc,
-            'canon': canon
-        }
         
         # Check if known analytic family
         if family_base in KNOWN_ANALYTIC_FAMILIES:
             graphs_skipped_known += 1
             if include_known:
-                known_family_results.append(graph_data)
+                known_family_results.append(
+                    make_graph_data(n, edges, family_base, family_desc))
             continue
         
-        # Compute polynomial and group by it
-        A = make_skew_symmetric_matrix(n, edges)
-        char_poly, var = compute_characteristic_polynomial(A)
-        poly_str = str(char_poly)
+        # Group by the characteristic polynomial's integer coefficients
+        group = poly_groups.get(coeffs)
+        if group is not None:
+            group['count'] += 1
+            continue
         
-        graph_data['polynomial'] = poly_str
-        poly_groups[poly_str].append(graph_data)
+        poly_str, analysis = cached_analysis(n, coeffs, analysis_cache, edges,
+                                             numeric_only)
+        poly_groups[coeffs] = {
+            'rep': make_graph_data(n, edges, family_base, family_desc),
+            'count': 1,
+            'polynomial': poly_str,
+            'analysis': analysis
+        }
 
     if verbose:
         print(f"Total unique graphs: {graphs_total}")
         print(f"Skipped {graphs_skipped_known} known analytic families")
-        print(f"Unique polynomials to analyze: {len(poly_groups)}\n")
+        print(f"Unique polynomials analyzed: {len(poly_groups)}\n")
     
-    # Pass 2: Analyze unique polynomials
     results = []
-    x = symbols('x')
     
-    for poly_str, graphs in poly_groups.items():
-        char_poly = sympify(poly_str)
-        
-        analysis = analyze_eigenvalues(char_poly, x)
+    for group in poly_groups.values():
+        analysis = group['analysis']
         
+        if analysis.get('skipped_reason') == 'not_tabled':
+            graphs_skipped_untabled += group['count']
+            continue
         if analysis.get('skipped_reason'):
-            graphs_skipped_poly += len(graphs)
+            graphs_skipped_poly += group['count']
             continue
             
         if analysis['all_analytic']:
-            rep = graphs[0]
+            rep = group['rep']
             
             result = {
                 'n': n,
-                'edges': [list(e) for e in rep['edges']],
-                'edge_string': edges_to_string(rep['edges']),
-                'edge_count': len(rep['edges']),
-                'adjacency_matrix': edges_to_adjacency_matrix(n, rep['edges']),
-                'polynomial': poly_str,
+                **rep['output'],
+                'polynomial': group['polynomial'],
                 'eigenvalues': analysis['eigenvalues'],
                 'family': rep['family'],
-                'isomorphism_class_size': len(graphs)
+                'isomorphism_class_size': group['count']
             }
             results.append(result)
     
     # Add known families if requested
     if include_known:
         for graph_data in known_family_results:
-            A = make_skew_symmetric_matrix(n, graph_data['edges'])
-            char_poly, var = compute_characteristic_polynomial(A)
-            analysis = analyze_eigenvalues(char_poly, x)
+            coeffs = graph_charpoly(n, graph_data['edges'])
+            poly_str, analysis = cached_analysis(n, coeffs, analysis_cache,
+                                             graph_data['edges'])
+            if not poly_str:
+                # Skipped by the pre-screen, which never builds the string
+                poly_str = str(polynomial_from_coeffs(coeffs)[0])
             
             result = {
                 'n': n,
-                'edges': [list(e) for e in graph_data['edges']],
-                'edge_string': edges_to_string(graph_data['edges']),
-                'edge_count': len(graph_data['edges']),
-                'adjacency_matrix': edges_to_adjacency_matrix(n, graph_data['edges']),
-                'polynomial': str(char_poly),
+                **graph_data['output'],
+                'polynomial': poly_str,
                 'eigenvalues': analysis.get('eigenvalues', []),
                 'family': graph_data['family'],
                 'known_family': True,
@@ -528,12 +1592,20 @@ def find_analytic_graphs(n, verbose=True, include_known=False):
             }
             results.append(result)
     
+    save_charpoly_cache(analysis_cache, cache_file)
+    
     if verbose:
         elapsed = time.time() - start_time
         print(f"Skipped {graphs_skipped_poly} graphs (irreducible degree > {MAX_ANALYTIC_DEGREE})")
+        if numeric_only:
+            print(f"Skipped {graphs_skipped_untabled} graphs (spectrum not tabled)")
         print(f"Time: {elapsed:.2f}s\n")
         print(f"Found {len(results)} non-isomorphic graphs with analytic eigenvalues")
     
+    if legacy_adjacency:
+        for r in results:
+            r['adjacency_matrix'] = edges_to_adjacency_matrix(n, r['edges'])
+    
     # Sort by edge count
     results.sort(key=lambda x: (x['edge_count'], x.get('polynomial', '')))
     
@@ -541,38 +1613,48 @@ def find_analytic_graphs(n, verbose=True, include_known=False):
 
 
 def print_results(results):
-    """Pretty-print the results."""
-    print("\n" + "="*70)
-    print("GRAPHS WITH ANALYTIC EIGENVALUES")
-    print("="*70)
+    """Pretty-print the results (built in one buffer, written once)."""
+    buf = io.StringIO()
+    w = buf.write
+    w("\n" + "="*70 + "\n")
+    w("GRAPHS WITH ANALYTIC EIGENVALUES\n")
+    w("="*70 + "\n")
     
     for i, r in enumerate(results, 1):
-        print(f"\n[{i}] ", end="")
+        w(f"\n[{i}] ")
         if r.get('family'):
-            print(f"{r['family']}")
+            w(f"{r['family']}\n")
         else:
-            print(f"Graph on {r['n']} vertices")
+            w(f"Graph on {r['n']} vertices\n")
         
-        print(f"    Edges: {r['edge_string']}")
-        print(f"    |E| = {r['edge_count']}, isomorphism class size = {r.get('isomorphism_class_size', 1)}")
-        print(f"    Characteristic polynomial: {r['polynomial']}")
-        print(f"    Eigenvalues:")
+        w(f"    Edges: {r['edge_string']}\n")
+        w(f"    |E| = {r['edge_count']}, isomorphism class size = {r.get('isomorphism_class_size', 1)}\n")
+        w(f"    Characteristic polynomial: {r['polynomial']}\n")
+        w(f"    Eigenvalues:\n")
         
         for eig in r.get('eigenvalues', []):
             mult_str = f" (mult. {eig['multiplicity']})" if eig['multiplicity'] > 1 else ""
             js = eig.get('js', {})
             formula = js.get('formula', eig.get('display', eig.get('raw', '?')))
-            print(f"        λ = {formula}{mult_str}")
+            w(f"        λ = {formula}{mult_str}\n")
     
-    print("\n" + "="*70)
-    print(f"Total: {len(results)} graphs with analytic eigenvalues")
-    print("="*70)
+    w("\n" + "="*70 + "\n")
+    w(f"Total: {len(results)} graphs with analytic eigenvalues\n")
+    w("="*70 + "\n")
+    sys.stdout.write(buf.getvalue())
+
+
+def dump_json(results):
+    """Results as indented JSON (UTF-8 bytes), via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(results, option=orjson.OPT_INDENT_2)
+    return json.dumps(results, indent=2).encode('utf-8')
 
 
 def save_results(results, filename):
     """Save results to JSON file."""
-    with open(filename, 'w') as f:
-        json.dump(results, f, indent=2)
+    with open(filename, 'wb') as f:
+        f.write(dump_json(results))
     print(f"\nResults saved to {filename}")
 
 
@@ -580,10 +1662,38 @@ def save_results(results, filename):
 # WEB API MODE (for integration with server.py)
 # =====================================================
 
-def json_mode(n):
-    """Output JSON only, for web integration."""
-    results = find_analytic_graphs(n, verbose=False, include_known=True)
-    print(json.dumps(results, indent=2))
+def json_mode(n, legacy=False):
+    """
+    Output JSON only, for web integration. The output for each n and
+    isomorphism backend is stored under RESULTS_CACHE_DIR and replayed on
+    later calls; delete the directory (or bump CACHE_VERSION) to invalidate it.
+    """
+    suffix = "_legacy" if legacy else ""
+    cache_path = os.path.join(
+        RESULTS_CACHE_DIR,
+        f"analytic_n{n}_deg{MAX_ANALYTIC_DEGREE}_v{CACHE_VERSION}"
+        f"_{isomorphism_backend()}{suffix}.json")
+    try:
+        with open(cache_path, 'rb') as f:
+            sys.stdout.buffer.write(f.read() + b"\n")
+        return
+    except OSError:
+        pass
+    
+    results = find_analytic_graphs(n, verbose=False, include_known=True,
+                                   legacy_adjacency=legacy)
+    data = dump_json(results)
+    
+    try:
+        os.makedirs(RESULTS_CACHE_DIR, exist_ok=True)
+        # Write then rename, so a concurrent reader never sees a partial file
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    sys.stdout.buffer.write(data + b"\n")
 
 
 # =====================================================
@@ -641,25 +1751,39 @@ def interactive_mode():
 
 def main():
     """Main entry point."""
-    if len(sys.argv) > 1:
-        if sys.argv[1] == '--json':
+    # --legacy (anywhere) adds the full adjacency_matrix to the output
+    legacy = '--legacy' in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != '--legacy']
+    
+    if args:
+        if args[0] == '--json':
             # JSON mode for web integration
-            n = int(sys.argv[2]) if len(sys.argv) > 2 else 5
-            json_mode(n)
+            n = int(args[1]) if len(args) > 1 else 5
+            json_mode(n, legacy)
+        elif args[0] == '--numeric':
+            # Numeric-only mode for large n
+            n = int(args[1]) if len(args) > 1 else 5
+            results = find_analytic_graphs(n, verbose=True, numeric_only=True,
+                                           legacy_adjacency=legacy)
+            print_results(results)
+            save_results(results, f"analytic_graphs_n{n}.json")
         else:
             # Command line mode
             try:
-                n = int(sys.argv[1])
-                results = find_analytic_graphs(n, verbose=True)
+                n = int(args[0])
+                results = find_analytic_graphs(n, verbose=True,
+                                               legacy_adjacency=legacy)
                 print_results(results)
                 
                 filename = f"analytic_graphs_n{n}.json"
                 save_results(results, filename)
                 
             except ValueError:
-                print(f"Error: '{sys.argv[1]}' is not a valid integer")
+                print(f"Error: '{args[0]}' is not a valid integer")
                 print("Usage: python find_analytic_graphs.py [n]")
                 print("       python find_analytic_graphs.py --json [n]")
+                print("       python find_analytic_graphs.py --numeric [n]")
+                print("       add --legacy to include full adjacency matrices")
                 sys.exit(1)
     else:
         interactive_mode()
@@ -1003,6 +1003,26 @@ export function rebuildEdgesFromMatrix() {
     console.log(`[Graph] Rebuilt ${state.edgeObjects.length} edges from matrix`);
 }
 
+/**
+ * Unpack the adjacency_bits field of find_analytic_graphs.py output into a
+ * skew-symmetric adjacency matrix. Bit k is the k-th vertex pair (i < j)
+ * in lexicographic order; a set bit means A[i][j] = 1, A[j][i] = -1.
+ */
+export function adjacencyFromBits(n, bits) {
+    const A = Array.from({ length: n }, () => Array(n).fill(0));
+    let k = 0;
+    for (let i = 0; i < n; i++) {
+        for (let j = i + 1; j < n; j++, k++) {
+            // Division instead of >> so masks wider than 32 bits work
+            if (Math.floor(bits / 2 ** k) % 2 === 1) {
+                A[i][j] = 1;
+                A[j][i] = -1;
+            }
+        }
+    }
+    return A;
+}
+
 // Remove a vertex and all its connected edges
 export function removeVertex(index) {
     const n = state.vertexMeshes.length;
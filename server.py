@@ -5,7 +5,6 @@ Prevents browser caching during development.
 """
 
 import http.server
-import socketserver
 import sys
 
 PORT = 8000
@@ -21,14 +20,15 @@ class NoCacheHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         super().end_headers()
     
     def log_message(self, format, *args):
-        # Cleaner log output
-        print(f"[{self.log_date_time_string()}] {args[0]}")
+        # Cleaner log output, as one write so threads do not interleave
+        sys.stdout.write(f"[{self.log_date_time_string()}] {args[0]}\n")
 
 if __name__ == '__main__':
     if len(sys.argv) > 1:
         PORT = int(sys.argv[1])
     
-    with socketserver.TCPServer(("", PORT), NoCacheHTTPRequestHandler) as httpd:
+    # One thread per request, so a slow response never blocks the others
+    with http.server.ThreadingHTTPServer(("", PORT), NoCacheHTTPRequestHandler) as httpd:
         print(f"╔══════════════════════════════════════════════════════════╗")
         print(f"║  Graph Eigenvalue Visualization Server                   ║")
         print(f"║  http://localhost:{PORT:<5}                                 ║")
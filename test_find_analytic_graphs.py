@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the coefficient pre-screen of find_analytic_graphs.py
+(has_large_irreducible_factor), checked against SymPy's factor_list.
+
+Run with: python -m unittest test_find_analytic_graphs
+"""
+
+import unittest
+
+from sympy import Poly, expand
+
+import find_analytic_graphs as fag
+
+x = fag._X
+
+# P_6: irreducible sextic with eigenvalues ±2cos(kπ/7)·i
+SEXTIC = x**6 + 5*x**4 + 6*x**2 + 1
+
+
+def coeffs_of(expr):
+    """Integer coefficient tuple of a polynomial in x, highest degree first."""
+    return tuple(int(c) for c in Poly(expand(expr), x).all_coeffs())
+
+
+class HasLargeIrreducibleFactorTest(unittest.TestCase):
+
+    def test_small_factor_times_sextic(self):
+        self.assertTrue(fag.has_large_irreducible_factor(
+            coeffs_of((x**2 + 1) * SEXTIC)))
+
+    def test_odd_n_sign_and_zero_root(self):
+        self.assertTrue(fag.has_large_irreducible_factor(coeffs_of(-x * SEXTIC)))
+
+    def test_product_of_quartics(self):
+        self.assertFalse(fag.has_large_irreducible_factor(
+            coeffs_of((x**4 + 3*x**2 + 1) * (x**4 + 4*x**2 + 1))))
+
+    def test_repeated_small_factor(self):
+        self.assertFalse(fag.has_large_irreducible_factor(
+            coeffs_of((x**2 + 1)**3 * (x**2 + 3))))
+
+    def test_agrees_with_factor_list(self):
+        # One-sided: True must always mean a factor past the cutoff
+        for n in range(2, 7):
+            for edges, _ in fag.enumerate_unique_graphs(n, use_geng=False):
+                coeffs = fag.graph_charpoly(n, edges)
+                if fag.has_large_irreducible_factor(coeffs):
+                    _, factors, _ = fag.factor_coeffs(coeffs)
+                    self.assertTrue(fag.check_degree_cutoff(factors), coeffs)
+
+
+if __name__ == '__main__':
+    unittest.main()
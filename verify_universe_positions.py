@@ -12,39 +12,48 @@ Usage: python verify_universe_positions.py [exported_file.txt]
 
 import sys
 import csv
-import math
 from collections import defaultdict
 
+import numpy as np
+
 # Position formula constants (must match graph-universe.js)
 N_SCALE = 8.0          # X = n × 8
 RHO_SCALE = 15.0       # Y = ρ × 15  
 ENERGY_SCALE = 8.0     # Z = (E - 8) × 8
 ENERGY_CENTER = 8.0
 
+def iter_csv_lines(f):
+    """
+    Yield the non-blank CSV lines of an open export file in one pass:
+    the lines after the CSV marker, or every line if there is no marker
+    or nothing follows it. Only the text up to the marker is buffered.
+    """
+    preamble = []
+    for line in f:
+        if line.strip():
+            preamble.append(line.strip())
+        if '--- CSV FORMAT' in line:
+            break
+    
+    found = False
+    for line in f:
+        if line.strip():
+            found = True
+            yield line.strip()
+    
+    if not found:
+        print("No CSV data found in file. Looking for raw CSV...")
+        yield from preamble
+
 def parse_csv_from_file(filepath):
     """Parse CSV data from exported Universe file."""
-    graphs = []
-    in_csv = False
-    csv_lines = []
-    
     with open(filepath, 'r') as f:
-        for line in f:
-            if '--- CSV FORMAT' in line:
-                in_csv = True
-                continue
-            if in_csv and line.strip():
-                csv_lines.append(line.strip())
-    
-    if not csv_lines:
-        print("No CSV data found in file. Looking for raw CSV...")
-        with open(filepath, 'r') as f:
-            csv_lines = [line.strip() for line in f if line.strip()]
-    
-    if not csv_lines:
-        return []
+        return parse_csv_rows(csv.DictReader(iter_csv_lines(f)))
+
+def parse_csv_rows(reader):
+    """Convert CSV rows to graph dicts, skipping malformed rows."""
+    graphs = []
     
-    # Parse CSV
-    reader = csv.DictReader(csv_lines)
     for row in reader:
         try:
             graphs.append({
@@ -67,12 +76,11 @@ def parse_csv_from_file(filepath):
     
     return graphs
 
-def compute_expected_position(graph):
-    """Compute expected position from pure absolute formula."""
-    n = graph['n']
-    rho = graph['spectralRadius']
-    energy = graph['energy']
-    
+def compute_expected_position(n, rho, energy):
+    """
+    Compute expected position from pure absolute formula. Works on scalars
+    or on NumPy arrays of n, ρ and E (one entry per graph).
+    """
     return (
         n * N_SCALE,
         rho * RHO_SCALE,
@@ -90,30 +98,27 @@ def verify_positions(graphs):
     print(f"  Z = (E - {ENERGY_CENTER}) × {ENERGY_SCALE}")
     print(f"\nTotal graphs: {len(graphs)}")
     
+    # Expected positions and distances for all graphs at once
+    arr = np.asarray([(g['n'], g['spectralRadius'], g['energy'], g['x'], g['y'], g['z'])
+                      for g in graphs], dtype=np.float64).reshape(-1, 6)
+    expected = np.column_stack(compute_expected_position(arr[:, 0], arr[:, 1], arr[:, 2]))
+    dist = np.sqrt(((arr[:, 3:] - expected) ** 2).sum(axis=1))
+    bad = np.flatnonzero(~(dist < 0.1))  # NaN positions count as wrong
+    perfect = len(graphs) - len(bad)
+    
     discrepancies = []
-    perfect = 0
-    
-    for g in graphs:
-        exp_x, exp_y, exp_z = compute_expected_position(g)
-        
-        dx = abs(g['x'] - exp_x)
-        dy = abs(g['y'] - exp_y)
-        dz = abs(g['z'] - exp_z)
-        dist = math.sqrt(dx*dx + dy*dy + dz*dz)
-        
-        if dist < 0.1:
-            perfect += 1
-        else:
-            discrepancies.append({
-                'name': g['name'],
-                'family': g['family'],
-                'n': g['n'],
-                'rho': g['spectralRadius'],
-                'energy': g['energy'],
-                'expected': (exp_x, exp_y, exp_z),
-                'actual': (g['x'], g['y'], g['z']),
-                'distance': dist
-            })
+    for i in bad.tolist():
+        g = graphs[i]
+        discrepancies.append({
+            'name': g['name'],
+            'family': g['family'],
+            'n': g['n'],
+            'rho': g['spectralRadius'],
+            'energy': g['energy'],
+            'expected': tuple(expected[i].tolist()),
+            'actual': (g['x'], g['y'], g['z']),
+            'distance': float(dist[i])
+        })
     
     print(f"\n✓ {perfect} graphs at correct positions")
     